@@ -3,35 +3,33 @@ Example usage of the movie recommendation system.
 This script demonstrates how to use the movie recommender with custom parameters.
 """
 
-from movie_recommender_new import load_data, calculate_popularity, recommend_popular_movies, visualize_popularity
+from movie_recommender_new import load_popularity, build_genre_index, recommend_popular_movies, top_n_iter, visualize_popularity
 
 def main():
-    print("Loading movie data...")
-    movies_df, ratings_df = load_data()
+    print("Loading movie popularity...")
+    popular_movies = load_popularity()
     
-    if movies_df is None or ratings_df is None:
+    if popular_movies is None:
         print("Failed to load data. Exiting.")
         return
     
-    print("Calculating movie popularity...")
-    popular_movies = calculate_popularity(movies_df, ratings_df)
+    genre_index = build_genre_index(popular_movies)
     
     print("\nExample 1: Top 15 Popular Movies")
-    top_15 = recommend_popular_movies(popular_movies, n=15)
-    for i, (_, movie) in enumerate(top_15.iterrows(), 1):
-        print(f"{i}. {movie['title']} - Popularity Score: {movie['popularity_score']:.2f}")
+    for i, title, score in top_n_iter(popular_movies, 15):
+        print(f"{i}. {title} - Popularity Score: {score:.2f}")
     
     print("\nExample 2: Top 5 Popular Comedy Movies")
-    comedy_movies = recommend_popular_movies(popular_movies, n=5, genre='Comedy')
+    comedy_movies = recommend_popular_movies(popular_movies, n=5, genre='Comedy', genre_index=genre_index)
     if comedy_movies is not None:
-        for i, (_, movie) in enumerate(comedy_movies.iterrows(), 1):
-            print(f"{i}. {movie['title']} - Popularity Score: {movie['popularity_score']:.2f}")
+        for i, (title, score) in enumerate(zip(comedy_movies['title'].to_numpy(), comedy_movies['popularity_score'].to_numpy()), 1):
+            print(f"{i}. {title} - Popularity Score: {score:.2f}")
     
     print("\nExample 3: Top 5 Popular Sci-Fi Movies")
-    scifi_movies = recommend_popular_movies(popular_movies, n=5, genre='Sci-Fi')
+    scifi_movies = recommend_popular_movies(popular_movies, n=5, genre='Sci-Fi', genre_index=genre_index)
     if scifi_movies is not None:
-        for i, (_, movie) in enumerate(scifi_movies.iterrows(), 1):
-            print(f"{i}. {movie['title']} - Popularity Score: {movie['popularity_score']:.2f}")
+        for i, (title, score) in enumerate(zip(scifi_movies['title'].to_numpy(), scifi_movies['popularity_score'].to_numpy()), 1):
+            print(f"{i}. {title} - Popularity Score: {score:.2f}")
     
     print("\nExample 4: Visualizing Top 10 Popular Movies")
     visualize_popularity(popular_movies, top_n=10)
@@ -1,32 +1,198 @@
 # Import necessary libraries
-import pandas as pd  # For data manipulation and analysis
+import os
+import weakref
 import numpy as np   # For numerical operations
-import matplotlib.pyplot as plt  # For creating visualizations
-from sklearn.preprocessing import MinMaxScaler  # For normalizing data
+
+# Set USE_MODIN=1 to run the pandas operations on all CPU cores with Modin
+if os.getenv('USE_MODIN', '').lower() in ('1', 'true', 'yes'):
+    import modin.pandas as pd  # Drop-in parallel replacement for pandas
+else:
+    import pandas as pd  # For data manipulation and analysis
 
 def load_data():
     """
     Load the MovieLens dataset from local CSV files.
 
     This function attempts to read the movies and ratings data from local CSV files.
+    Parsed data is cached next to each CSV file as Parquet, which is reused on later
+    runs while it is newer than the CSV file.
     If the files are not found, it returns None values and displays an error message.
 
     Returns:
-        movies_df (DataFrame): Contains movie information (movieId, title, genres)
-        ratings_df (DataFrame): Contains user ratings (userId, movieId, rating, timestamp)
+        movies_df (DataFrame): Contains movie information (movieId, title, genres, genre_set)
+        ratings_df (DataFrame): Contains user ratings (userId, movieId, rating)
     """
     try:
-        # Attempt to load data from local CSV files
-        movies_df = pd.read_csv('movies.csv')
-        ratings_df = pd.read_csv('ratings.csv')
+        # Attempt to load data from local CSV files, using compact dtypes and
+        # skipping the unused timestamp column to reduce memory usage
+        movies_df = _read_csv_cached('movies.csv', dtype={'movieId': 'int32'})
+        ratings_df = _read_csv_cached('ratings.csv', usecols=['userId', 'movieId', 'rating'],
+                                      dtype={'userId': 'int32', 'movieId': 'int32', 'rating': 'float32'})
         print("Data loaded from local files.")
     except FileNotFoundError:
         # Display error message if files are not found
         print("Local CSV files not found. Please ensure 'movies.csv' and 'ratings.csv' are in the same directory as this script.")
         return None, None
 
+    # Use categorical movie IDs so grouping works on compact integer codes
+    movies_df['movieId'] = movies_df['movieId'].astype('category')
+    ratings_df['movieId'] = ratings_df['movieId'].astype('category')
+
+    # Parse the pipe-separated genres once so genre filters are set lookups
+    movies_df['genre_set'] = _parse_genres(movies_df['genres'])
+
     return movies_df, ratings_df
 
+def _read_csv_cached(csv_path, **read_csv_kwargs):
+    """
+    Read a CSV file, reusing a Parquet copy of it when one is up to date.
+
+    Parquet is typed and binary, so reading it is much faster than parsing the CSV.
+    CSV files are parsed with the multi-threaded pyarrow engine when it is installed;
+    otherwise the default parser is used and the CSV file is read every time.
+    The cache is best-effort: an unreadable or unwritable Parquet file is ignored.
+
+    Args:
+        csv_path (str): Path to the CSV file
+        **read_csv_kwargs: Extra arguments passed to pd.read_csv
+
+    Returns:
+        DataFrame: The parsed data
+    """
+    parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+    csv_mtime = os.path.getmtime(csv_path)
+
+    # Reuse the cached copy unless the CSV file changed after it was written
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= csv_mtime:
+        try:
+            return pd.read_parquet(parquet_path)
+        except (ImportError, OSError, ValueError):
+            # No Parquet engine, or the cached file is unreadable or corrupt
+            pass
+
+    try:
+        # The pyarrow parser reads the file on multiple threads
+        df = pd.read_csv(csv_path, engine='pyarrow', **read_csv_kwargs)
+    except ImportError:
+        df = pd.read_csv(csv_path, **read_csv_kwargs)
+
+    try:
+        df.to_parquet(parquet_path, index=False)
+    except (ImportError, OSError, ValueError):
+        # No Parquet engine, or the directory is not writable
+        pass
+
+    return df
+
+def _parse_genres(genres):
+    """
+    Parse pipe-separated genre strings into sets of lower-case genre names.
+
+    Genre names are lower-cased so that genre filters are case-insensitive.
+
+    Args:
+        genres (Series): Pipe-separated genre strings
+
+    Returns:
+        Series: A frozenset of lower-case genre names for each entry
+    """
+    return genres.fillna('').str.lower().str.split('|').apply(frozenset)
+
+def _genre_mask(popularity_df, genre):
+    """
+    Find which movies belong to a genre.
+
+    Uses a case-insensitive set-membership test on the parsed genres instead
+    of a regex search over the raw genres string.
+
+    Args:
+        popularity_df (DataFrame): DataFrame with movie popularity information
+        genre (str): Genre to filter by
+
+    Returns:
+        ndarray: Boolean mask that is True for movies tagged with the given genre
+    """
+    genre = genre.lower()
+    return popularity_df['genre_set'].map(lambda genres: genre in genres).to_numpy(dtype=bool)
+
+def _filter_by_genre(popularity_df, genre):
+    """
+    Select the movies that belong to a genre.
+
+    Args:
+        popularity_df (DataFrame): DataFrame with movie popularity information
+        genre (str): Genre to filter by
+
+    Returns:
+        DataFrame: Movies tagged with the given genre
+    """
+    return popularity_df[_genre_mask(popularity_df, genre)]
+
+def _min_and_range(values):
+    """
+    Find the minimum and the range (max - min) of an array.
+
+    Args:
+        values (ndarray): Values to measure
+
+    Returns:
+        tuple: The minimum and the range, with a range of 0 replaced by 1
+    """
+    min_value = values.min()
+    value_range = values.max() - min_value
+    # Avoid division by zero when all values are identical
+    if value_range == 0:
+        value_range = 1
+    return min_value, value_range
+
+# Set USE_NUMBA=1 to compute popularity scores with a compiled numba kernel. Once
+# loaded the kernel is faster than NumPy, but importing numba and loading the cached
+# kernel takes about a second per process (several seconds for the first compile),
+# which outweighs the gain for a single run on MovieLens-sized data.
+USE_NUMBA = os.getenv('USE_NUMBA', '').lower() in ('1', 'true', 'yes')
+
+# Compiled popularity kernel; None until first needed, False if numba is missing
+_popularity_kernel = None
+
+def _get_popularity_kernel():
+    """
+    Compile the numba popularity kernel on first use.
+
+    numba is imported here rather than at module load so that importing this
+    module stays fast when the kernel is not needed.
+
+    Returns:
+        function: The compiled kernel, or None if numba is not installed
+    """
+    global _popularity_kernel
+
+    if _popularity_kernel is None:
+        try:
+            from numba import njit, prange
+        except ImportError:
+            _popularity_kernel = False
+            return None
+
+        @njit(parallel=True, fastmath=True, cache=True)
+        def weighted_popularity(avg_rating, rating_count, out):
+            # Normalize and weight both values in a single compiled loop
+            rating_min = avg_rating.min()
+            rating_range = avg_rating.max() - rating_min
+            count_min = rating_count.min()
+            count_range = rating_count.max() - count_min
+            # Avoid division by zero when all values are identical
+            if rating_range == 0:
+                rating_range = 1.0
+            if count_range == 0:
+                count_range = 1.0
+            for i in prange(avg_rating.size):
+                out[i] = (0.4 * (avg_rating[i] - rating_min) / rating_range +
+                          0.6 * (rating_count[i] - count_min) / count_range)
+
+        _popularity_kernel = weighted_popularity
+
+    return _popularity_kernel or None
+
 def calculate_popularity(movies_df, ratings_df):
     """
     Calculate popularity scores for movies based on ratings data.
@@ -43,39 +209,173 @@ def calculate_popularity(movies_df, ratings_df):
         ratings_df (DataFrame): Contains user ratings
 
     Returns:
-        DataFrame: Movies with calculated popularity scores, sorted by popularity
+        DataFrame: Movies with calculated popularity scores (unsorted)
+    """
+    # Calculate average rating and number of ratings for each movie in a single pass
+    popularity_df = ratings_df.groupby('movieId', observed=True, sort=False)['rating'].agg(
+        avg_rating='mean', rating_count='count').reset_index()
+
+    avg_rating = popularity_df['avg_rating'].to_numpy(dtype=np.float64)
+    rating_count = popularity_df['rating_count'].to_numpy(dtype=np.float64)
+
+    kernel = _get_popularity_kernel() if USE_NUMBA else None
+    if kernel is not None:
+        # Normalize and weight both values in one compiled pass
+        popularity_score = np.empty_like(avg_rating)
+        kernel(avg_rating, rating_count, popularity_score)
+    else:
+        rating_min, rating_range = _min_and_range(avg_rating)
+        count_min, count_range = _min_and_range(rating_count)
+
+        # Normalize both values to a 0-1 scale and weight them (40% rating, 60% number
+        # of ratings) with in-place operations, folding each weight into its scale
+        # factor, so only the score and one temporary array are allocated
+        popularity_score = np.subtract(avg_rating, rating_min)
+        popularity_score *= 0.4 / rating_range
+        weighted_count = np.subtract(rating_count, count_min)
+        weighted_count *= 0.6 / count_range
+        popularity_score += weighted_count
+    popularity_df['popularity_score'] = popularity_score
+
+    # Parse genres if the movies were not loaded through load_data
+    if 'genre_set' not in movies_df:
+        movies_df = movies_df.assign(genre_set=_parse_genres(movies_df['genres']))
+
+    # Look up titles and genres by movie ID instead of building a full merge
+    # of the two tables
+    movie_info = movies_df.set_index('movieId')
+    for column in movie_info.columns:
+        popularity_df[column] = popularity_df['movieId'].map(movie_info[column])
+
+    # Drop rated movies that are missing from the movies table
+    return popularity_df.dropna(subset=['title'])
+
+def load_popularity(cache_path='popularity_cache.parquet'):
     """
-    # Calculate average rating for each movie
-    avg_ratings = ratings_df.groupby('movieId')['rating'].mean().reset_index()
-    avg_ratings.columns = ['movieId', 'avg_rating']
+    Load movie popularity scores, reusing the results of an earlier run if possible.
+
+    The scores are saved to a Parquet file after being calculated. Later calls read
+    that file instead of loading the ratings and recalculating, as long as it is newer
+    than both CSV files. If no Parquet engine (pyarrow) is installed, or the saved file
+    cannot be read or written, the scores are recalculated instead.
 
-    # Calculate number of ratings for each movie
-    rating_counts = ratings_df.groupby('movieId')['rating'].count().reset_index()
-    rating_counts.columns = ['movieId', 'rating_count']
+    Args:
+        cache_path (str): Path of the Parquet file holding saved scores
+            (default: 'popularity_cache.parquet')
 
-    # Merge average ratings and rating counts
-    popularity_df = pd.merge(avg_ratings, rating_counts, on='movieId')
+    Returns:
+        DataFrame: Movies with calculated popularity scores, or None if the data
+            could not be loaded
+    """
+    try:
+        data_mtime = max(os.path.getmtime('movies.csv'), os.path.getmtime('ratings.csv'))
+        cache_is_fresh = os.path.getmtime(cache_path) >= data_mtime
+    except OSError:
+        cache_is_fresh = False
 
-    # Normalize the values to a 0-1 scale using MinMaxScaler
-    scaler = MinMaxScaler()
-    popularity_df[['avg_rating_scaled', 'rating_count_scaled']] = scaler.fit_transform(
-        popularity_df[['avg_rating', 'rating_count']])
+    if cache_is_fresh:
+        try:
+            popularity_df = pd.read_parquet(cache_path)
+        except (ImportError, OSError, ValueError):
+            # No Parquet engine, or the saved file is unreadable or corrupt
+            pass
+        else:
+            # Genre sets cannot be stored in Parquet, so rebuild them
+            popularity_df['genre_set'] = _parse_genres(popularity_df['genres'])
+            print("Popularity scores loaded from cache.")
+            return popularity_df
+
+    movies_df, ratings_df = load_data()
+    if movies_df is None or ratings_df is None:
+        return None
+
+    popularity_df = calculate_popularity(movies_df, ratings_df)
+    try:
+        popularity_df.drop(columns='genre_set').to_parquet(cache_path, index=False)
+    except (ImportError, OSError, ValueError):
+        # No Parquet engine, or the directory is not writable
+        pass
 
-    # Calculate weighted popularity score (40% rating, 60% number of ratings)
-    popularity_df['popularity_score'] = (
-        0.4 * popularity_df['avg_rating_scaled'] +
-        0.6 * popularity_df['rating_count_scaled']
-    )
+    return popularity_df
+
+def _get_cached(cache, df):
+    """
+    Look up a result cached for a DataFrame object.
+
+    DataFrames are unhashable, so results are keyed by object identity. A weak
+    reference is stored with each result to make sure the id still belongs to the
+    same DataFrame.
+
+    Args:
+        cache (dict): Cache to look in
+        df (DataFrame): DataFrame the result was computed from
+
+    Returns:
+        The cached result, or None if there is none for this DataFrame
+    """
+    entry = cache.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    return None
+
+def _set_cached(cache, df, result):
+    """
+    Store a result computed from a DataFrame object.
+
+    The entry is removed automatically once the DataFrame is garbage collected.
+
+    Args:
+        cache (dict): Cache to store the result in
+        df (DataFrame): DataFrame the result was computed from
+        result: Result to cache
+    """
+    key = id(df)
 
-    # Sort by popularity score in descending order
-    popularity_df = popularity_df.sort_values('popularity_score', ascending=False)
+    def evict(ref):
+        # Only remove the entry if it has not been replaced since
+        entry = cache.get(key)
+        if entry is not None and entry[0] is ref:
+            del cache[key]
 
-    # Merge with movie information to get titles and genres
-    result = pd.merge(popularity_df, movies_df, on='movieId')
+    cache[key] = (weakref.ref(df, evict), result)
 
-    return result
+# Genre indexes built by build_genre_index, keyed by popularity DataFrame
+_GENRE_INDEX_CACHE = {}
 
-def recommend_popular_movies(popularity_df, n=10, genre=None):
+def build_genre_index(popularity_df):
+    """
+    Build a lookup of movies per genre, each sorted by popularity.
+
+    Building the index once lets repeated genre recommendations skip filtering
+    and sorting the full popularity table on every call. The index is cached, so
+    calling this again with the same DataFrame does not rebuild it. The returned
+    dict is a new mapping, but the per-genre DataFrames in it are shared with the
+    cache and must not be modified in place.
+
+    Args:
+        popularity_df (DataFrame): DataFrame with movie popularity information
+
+    Returns:
+        dict: Maps each lower-case genre name to a DataFrame of its movies sorted by
+            popularity score
+    """
+    genre_index = _get_cached(_GENRE_INDEX_CACHE, popularity_df)
+    if genre_index is not None:
+        # Copy only the mapping; the per-genre DataFrames are shared with the cache
+        return dict(genre_index)
+
+    # Give each movie one row per genre it belongs to, keyed case-insensitively
+    exploded = popularity_df.assign(
+        genre=popularity_df['genres'].str.lower().str.split('|')).explode('genre')
+
+    genre_index = {
+        genre: movies.drop(columns='genre').sort_values('popularity_score', ascending=False)
+        for genre, movies in exploded.groupby('genre', sort=False)
+    }
+    _set_cached(_GENRE_INDEX_CACHE, popularity_df, genre_index)
+    return dict(genre_index)
+
+def recommend_popular_movies(popularity_df, n=10, genre=None, genre_index=None):
     """
     Recommend the top n popular movies, optionally filtered by genre.
 
@@ -87,84 +387,145 @@ def recommend_popular_movies(popularity_df, n=10, genre=None):
         popularity_df (DataFrame): DataFrame with movie popularity information
         n (int): Number of movies to recommend (default: 10)
         genre (str, optional): Genre to filter by (default: None)
+        genre_index (dict, optional): Index from build_genre_index to look up
+            genre recommendations without rescanning popularity_df (default: None)
 
     Returns:
         DataFrame: Top n recommended movies sorted by popularity score
     """
-    if genre:
+    if genre and genre_index is not None:
+        # Look up the presorted movies for this genre
+        genre_movies = genre_index.get(genre.lower())
+        if genre_movies is None:
+            print(f"No movies found for genre: {genre}")
+            return None
+        return genre_movies.head(n)
+    elif genre:
         # Filter movies by the specified genre
-        filtered_df = popularity_df[popularity_df['genres'].str.contains(genre, case=False, na=False)]
+        filtered_df = _filter_by_genre(popularity_df, genre)
 
         # Check if any movies were found for the genre
         if filtered_df.empty:
             print(f"No movies found for genre: {genre}")
             return None
 
-        # Sort by popularity score to ensure we get the most popular movies in this genre
-        filtered_df = filtered_df.sort_values('popularity_score', ascending=False)
-        return filtered_df.head(n)
+        # Select the most popular movies in this genre without sorting them all
+        return filtered_df.nlargest(n, 'popularity_score')
     else:
         # Return the top n most popular movies overall
-        return popularity_df.head(n)
+        return popularity_df.nlargest(n, 'popularity_score')
+
+def top_n_iter(popularity_df, n, genre=None):
+    """
+    Yield the top n popular movies without building a DataFrame of them.
+
+    The top scores are selected with a partial sort over the score array, which is
+    cheaper than sorting every movie when only a few are needed for printing.
 
-def visualize_popularity(popularity_df, top_n=20, genre=None):
+    Args:
+        popularity_df (DataFrame): DataFrame with movie popularity information
+        n (int): Number of movies to yield
+        genre (str, optional): Genre to filter by (default: None)
+
+    Yields:
+        tuple: Rank (starting at 1), title and popularity score of each movie
+    """
+    scores = popularity_df['popularity_score'].to_numpy()
+    titles = popularity_df['title'].to_numpy()
+    if genre:
+        mask = _genre_mask(popularity_df, genre)
+        scores = scores[mask]
+        titles = titles[mask]
+
+    n = min(n, scores.size)
+    if n <= 0:
+        return
+
+    # Partially sort to find the n highest scores, then order only those
+    top = np.argpartition(-scores, n - 1)[:n]
+    top = top[np.argsort(-scores[top], kind='stable')]
+    for rank, i in enumerate(top, 1):
+        yield rank, titles[i], scores[i]
+
+# Figure and axes reused by visualize_popularity when no axes are passed in
+_FIG = None
+_AX = None
+
+def visualize_popularity(popularity_df, top_n=20, genre=None, ax=None):
     """
     Create a horizontal bar chart of the top N popular movies.
 
     This function visualizes the most popular movies overall or within a specific genre.
     It saves the visualization as a PNG file and displays a message with the filename.
+    Unless axes are given, a single figure is created on first use and reused by
+    later calls, so rendering many charts does not allocate a figure each time.
 
     Args:
         popularity_df (DataFrame): DataFrame with movie popularity information
         top_n (int): Number of top movies to visualize (default: 20)
         genre (str, optional): Genre to filter by (default: None)
+        ax (Axes, optional): Matplotlib axes to draw on (default: None)
     """
-    # Create a new figure with specified size
-    plt.figure(figsize=(12, 8))
+    global _FIG, _AX
 
     if genre:
         # Filter by genre if specified
-        filtered_df = popularity_df[popularity_df['genres'].str.contains(genre, case=False, na=False)]
+        filtered_df = _filter_by_genre(popularity_df, genre)
 
         # Check if any movies were found for the genre
         if filtered_df.empty:
             print(f"No movies found for genre: {genre}")
             return
 
-        # Sort by popularity score and get top movies
-        filtered_df = filtered_df.sort_values('popularity_score', ascending=False)
-        top_movies = filtered_df.head(top_n)
+        # Get top movies without sorting the whole genre
+        top_movies = filtered_df.nlargest(top_n, 'popularity_score')
 
         # Set title and filename for genre-specific visualization
         title = f'Top {top_n} Popular {genre} Movies'
         filename = f'top_popular_{genre.lower()}_movies.png'
     else:
         # Get top movies overall
-        top_movies = popularity_df.head(top_n)
+        top_movies = popularity_df.nlargest(top_n, 'popularity_score')
 
         # Set title and filename for overall popularity visualization
         title = f'Top {top_n} Popular Movies'
         filename = 'top_popular_movies.png'
 
+    reuse_axes = ax is None
+    if reuse_axes:
+        if _AX is None:
+            # Import matplotlib only when a chart is drawn. A Figure created
+            # directly is not tracked by pyplot and renders without a GUI backend.
+            from matplotlib.figure import Figure
+            _FIG = Figure(figsize=(12, 8))
+            _AX = _FIG.add_subplot()
+        ax = _AX
+    fig = ax.figure
+
     # Create horizontal bar chart
-    plt.barh(top_movies['title'], top_movies['popularity_score'])
-    plt.xlabel('Popularity Score')
-    plt.ylabel('Movie Title')
-    plt.title(title)
-    plt.tight_layout()  # Adjust layout to make room for labels
+    ax.barh(top_movies['title'], top_movies['popularity_score'])
+    ax.set_xlabel('Popularity Score')
+    ax.set_ylabel('Movie Title')
+    ax.set_title(title)
+    fig.tight_layout()  # Adjust layout to make room for labels
 
-    # Save the figure and close it
-    plt.savefig(filename)
-    plt.close()
+    # Save the figure and clear the shared axes for the next chart
+    fig.savefig(filename)
+    if reuse_axes:
+        ax.clear()
 
     print(f"Visualization saved as '{filename}'")
 
+# Genre lists built by get_available_genres, keyed by movies DataFrame
+_GENRE_CACHE = {}
+
 def get_available_genres(movies_df):
     """
     Extract all unique genres from the movies dataframe.
 
     This function parses the genres column, which contains pipe-separated genre lists,
-    and returns a sorted list of all unique genres in the dataset.
+    and returns a sorted list of all unique genres in the dataset. The result is
+    cached, so repeated calls with the same DataFrame do not rescan it.
 
     Args:
         movies_df (DataFrame): DataFrame containing movie information
@@ -172,18 +533,14 @@ def get_available_genres(movies_df):
     Returns:
         list: Sorted list of unique genres
     """
-    # Initialize empty list to store all genres
-    all_genres = []
-
-    # Iterate through each movie's genres
-    for genres in movies_df['genres'].str.split('|'):
-        # Check if genres is a list (not NaN)
-        if isinstance(genres, list):
-            # Add all genres from this movie to the list
-            all_genres.extend(genres)
+    genres = _get_cached(_GENRE_CACHE, movies_df)
+    if genres is None:
+        # Split every genre list, flatten it and keep each genre once
+        genres = sorted(movies_df['genres'].dropna().str.split('|').explode().unique().tolist())
+        _set_cached(_GENRE_CACHE, movies_df, genres)
 
-    # Return sorted list of unique genres
-    return sorted(list(set(all_genres)))
+    # Return a copy so callers cannot modify the cached list
+    return list(genres)
 
 def get_user_input(available_genres):
     """
@@ -290,16 +647,16 @@ def main():
     if user_prefs["type"] == "popularity":
         # Display popularity-based recommendations
         print(f"\nTop {user_prefs['n']} Popular Movies:")
-        top_movies = recommend_popular_movies(popular_movies, n=user_prefs['n'])
-        for i, (_, movie) in enumerate(top_movies.iterrows(), 1):
-            print(f"{i}. {movie['title']} - Popularity Score: {movie['popularity_score']:.2f}")
+        for i, title, score in top_n_iter(popular_movies, user_prefs['n']):
+            print(f"{i}. {title} - Popularity Score: {score:.2f}")
     else:
         # Display genre-based recommendations
         print(f"\nTop {user_prefs['n']} Popular {user_prefs['genre']} Movies:")
-        genre_movies = recommend_popular_movies(popular_movies, n=user_prefs['n'], genre=user_prefs['genre'])
-        if genre_movies is not None:
-            for i, (_, movie) in enumerate(genre_movies.iterrows(), 1):
-                print(f"{i}. {movie['title']} - Popularity Score: {movie['popularity_score']:.2f}")
+        genre_movies = list(top_n_iter(popular_movies, user_prefs['n'], genre=user_prefs['genre']))
+        if not genre_movies:
+            print(f"No movies found for genre: {user_prefs['genre']}")
+        for i, title, score in genre_movies:
+            print(f"{i}. {title} - Popularity Score: {score:.2f}")
 
     # Step 6: Offer visualization option
     visualize = input("\nWould you like to visualize the results? (y/n): ").lower()